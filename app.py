@@ -7,14 +7,20 @@
 
 import streamlit as st
 import pandas as pd
-from datetime import datetime, date
-from google_auth_oauthlib.flow import Flow
-from google.oauth2 import id_token
-from google.auth.transport import requests
-from urllib.parse import urlencode
+import numpy as np
+from datetime import datetime, date, timedelta
 from google.oauth2.service_account import Credentials
 import gspread
-import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# Copy-on-Write: row selections share memory until a column is actually
+# modified, so the table sections don't need defensive .copy() calls.
+# (Always on — and the option deprecated — from pandas 3.0.)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # ============================================================
 # PAGE CONFIG
@@ -25,10 +31,10 @@ st.set_page_config(page_title="Med-X Operational Excellence Portal", layout="wid
 # Image Loader for Icons (Base64)
 # ============================================================
 import base64
-import os
 
+@st.cache_data(show_spinner=False)
 def load_base64_image(path):
-    """Load an image file as base64 (used for title icon)."""
+    """Load an image file as base64 (cached per path — assets are static)."""
     try:
         with open(path, "rb") as img_file:
             return base64.b64encode(img_file.read()).decode()
@@ -36,17 +42,14 @@ def load_base64_image(path):
         return None
 
 # Prepare icon for title (icon.png must exist in app folder)
-TITLE_ICON_BASE64 = None
-if os.path.exists("icon.png"):
-    TITLE_ICON_BASE64 = load_base64_image("icon.png")
+TITLE_ICON_BASE64 = load_base64_image("icon.png")
 
 
 # ============================================================
 # UI CSS (sidebar profile card, logo styling, toast fallback)
 # + Fullscreen Exit Button Styling
 # ============================================================
-st.markdown(
-    """
+APP_CSS = """
     <style>
     /* Make main area slightly spaced */
     .block-container {
@@ -152,12 +155,6 @@ st.markdown(
     .toast.warn  { border-left-color: #f59e0b; }
     .toast.error { border-left-color: #ef4444; }
 
-    /* Green highlight for completed status */
-    [data-testid="stDataFrame"] td div:contains("Completed") {
-        color: #10b981 !important;
-        font-weight: 600 !important;
-    }
-
     /* Fix sticky scrolling bug */
     .stDataFrame {
         position: static !important;
@@ -189,15 +186,16 @@ st.markdown(
     }
 
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+
+# Re-emitted every run: Streamlit drops elements a rerun does not emit,
+# so skipping this would strip the styles after the first interaction.
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # ============================================================
 # Fullscreen Exit Fix (JS helper)
 # ============================================================
-st.markdown(
-    """
+FULLSCREEN_JS = """
     <script>
     // Add an "Exit Fullscreen" button inside the fullscreen container
     function attachExitButton() {
@@ -220,20 +218,29 @@ st.markdown(
         fsWrapper.appendChild(btn);
     }
 
-    // Check regularly if fullscreen is active
-    const fsInterval = setInterval(attachExitButton, 400);
+    // Install once per page: re-injection must not stack observers/listeners
+    if (!window.__mexExitBtnInit) {
+        window.__mexExitBtnInit = true;
 
-    // ESC key also exits fullscreen
-    document.addEventListener("keydown", function(e) {
-        if (e.key === "Escape") {
-            const fsWrapper = document.querySelector("div[data-testid='stElementFullscreen']");
-            if (fsWrapper) fsWrapper.click();
-        }
-    });
+        // React only when nodes are added (e.g. fullscreen opens) — no polling
+        const fsObserver = new MutationObserver(attachExitButton);
+        fsObserver.observe(document.body, { childList: true, subtree: true });
+
+        // ESC key also exits fullscreen
+        document.addEventListener("keydown", function(e) {
+            if (e.key === "Escape") {
+                const fsWrapper = document.querySelector("div[data-testid='stElementFullscreen']");
+                if (fsWrapper) fsWrapper.click();
+            }
+        });
+    }
     </script>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+
+# Listeners/timers outlive their <script> element — inject once per session
+if not st.session_state.get("_fs_js_injected"):
+    st.markdown(FULLSCREEN_JS, unsafe_allow_html=True)
+    st.session_state["_fs_js_injected"] = True
 
 # ============================================================
 # Load OAuth Credentials (from Streamlit secrets)
@@ -267,8 +274,9 @@ SERVICE_ACCOUNT_INFO = st.secrets["gcp_service_account"]["service_account_json"]
 SHEET_ID = st.secrets["google_sheets"]["sheet_id"]
 
 
-def connect_to_gspread():
-    import json
+@st.cache_resource(show_spinner=False)
+def get_gc():
+    """Authorized gspread client, built once per process and shared across sessions."""
     service_account_info = json.loads(SERVICE_ACCOUNT_INFO)
 
     creds = Credentials.from_service_account_info(
@@ -281,55 +289,259 @@ def connect_to_gspread():
     return gspread.authorize(creds)
 
 
-gc = connect_to_gspread()
-sheet = gc.open_by_key(SHEET_ID).sheet1
+@st.cache_resource(show_spinner=False)
+def get_main_sheet():
+    return get_gc().open_by_key(SHEET_ID).sheet1
+
 
 # ============================================================
 # Audit Log Sheet (kept as before)
 # ============================================================
+@st.cache_resource(show_spinner=False)
 def get_audit_sheet():
+    sh = get_gc().open_by_key(SHEET_ID)
     try:
-        return gc.open_by_key(SHEET_ID).worksheet("audit_log")
+        return sh.worksheet("audit_log")
     except Exception:
-        sh = gc.open_by_key(SHEET_ID)
         audit = sh.add_worksheet("audit_log", rows=2000, cols=10)
         audit.update([["timestamp", "action", "task", "user", "old_value", "new_value"]])
         return audit
 
 
+# Cached handles — cheap lookups on every rerun after the first
+sheet = get_main_sheet()
 audit_sheet = get_audit_sheet()
 
 
-def log_audit(action, task, user, old_value="", new_value=""):
+AUDIT_FLUSH_SIZE = 20  # flush early once this many events are buffered
+
+# Pending work captured by batched_writes() (per thread / session): cells,
+# cache edits and audit events, held until the sheet write succeeds
+_write_batch = threading.local()
+
+
+def flush_audit_log():
+    """
+    Write all buffered audit events in a single append_rows call.
+    """
+    buf = st.session_state.get("_audit_buf")
+    if not buf:
+        return
     try:
-        audit_sheet.append_row([
-            str(datetime.now()), action, task, user, old_value, new_value
-        ])
+        audit_sheet.append_rows(buf, value_input_option="RAW")
+        st.session_state["_audit_buf"] = []
     except Exception:
-        # Never break the app for audit failures
+        # Never break the app for audit failures (events stay buffered)
         pass
 
+
+def log_audit(action, task, user, old_value="", new_value=""):
+    """
+    Buffer an audit event; flushed in one batch at the start of the next
+    rerun, at the end of the script, or when the buffer fills up.
+    Inside batched_writes() the event is held until the sheet write succeeds.
+    """
+    event = [str(datetime.now()), action, task, user, old_value, new_value]
+    held = getattr(_write_batch, "audit", None)
+    if held is not None:
+        held.append(event)
+        return
+    _buffer_audit_events([event])
+
+
+def _buffer_audit_events(events):
+    buf = st.session_state.setdefault("_audit_buf", [])
+    buf.extend(events)
+    if len(buf) >= AUDIT_FLUSH_SIZE:
+        flush_audit_log()
+
+
+# Flush anything buffered by the previous pass (save handlers end in st.rerun)
+flush_audit_log()
+
 # ============================================================
 # Column mapping (sheet-level). Keep sync with sheet header.
 # ============================================================
 COLS = ["task", "description", "assigned_to", "assigned_by", "due_date", "status", "created_at"]
-COL_IDX = {c: i + 1 for i, c in enumerate(COLS)}  # 1-based for gspread
+
+# Hidden change-tracking column (after COLS). Stamped on every write so a
+# refresh only has to re-download rows whose version changed.
+VERSION_COL = "row_version"
+SHEET_COLS = COLS + [VERSION_COL]
+COL_IDX = {c: i + 1 for i, c in enumerate(SHEET_COLS)}  # 1-based for gspread
+
+# Cache-only parsed dates (never written to the sheet): source col -> parsed col.
+# Parsed once on ingest / per written row instead of on every rerun.
+# created_at is only ever range-filtered, so it is kept as int64 day numbers
+# (days since epoch, NAT_DAY when unparseable) — the filter is an int compare.
+CREATED_DAY_COL = "created_at_day"
+NAT_DAY = np.iinfo(np.int64).min
+DERIVED_DATE_COLS = {"created_at": CREATED_DAY_COL, "due_date": "due_date_parsed"}
+CACHE_COLS = SHEET_COLS + list(DERIVED_DATE_COLS.values())
+
+
+def day_number(d):
+    """date -> int64 days since epoch (same scale as CREATED_DAY_COL)."""
+    return int(np.datetime64(d, "D").astype(np.int64))
+
+
+def _to_timestamps(values):
+    """
+    Parse sheet dates value by value: the columns mix formats (ISO with and
+    without microseconds, slashes, hand-typed dates), so a single format
+    inferred from the first row would turn the rest into NaT. Offsets are
+    normalised to UTC, then dropped.
+    """
+    ts = pd.to_datetime(values, errors="coerce", format="mixed", utc=True)
+    return ts.dt.tz_localize(None) if isinstance(ts, pd.Series) else ts.tz_localize(None)
+
+
+def _parse_dates(series, parsed):
+    ts = _to_timestamps(series)
+    if parsed == CREATED_DAY_COL:
+        return pd.Series(ts.to_numpy(dtype="datetime64[D]").astype(np.int64), index=series.index)
+    return ts.dt.date
+
+
+def _parse_date(v, parsed):
+    """Scalar twin of _parse_dates for single-row cache updates."""
+    ts = _to_timestamps(v)
+    if parsed == CREATED_DAY_COL:
+        return NAT_DAY if pd.isna(ts) else day_number(ts.date())
+    return pd.NaT if pd.isna(ts) else ts.date()
+
+# Soft-delete marker: deleted rows keep their sheet position
+DELETED_STATUS = "Deleted"
+
+# Statuses a user can pick / filter on
+TASK_STATUSES = ["Pending", "In-Progress", "Completed"]
+
+# status is low-cardinality and filtered on every render — store it as a
+# categorical (integer codes). "" covers blank / unrecognised sheet values.
+STATUS_DTYPE = pd.CategoricalDtype(TASK_STATUSES + [DELETED_STATUS, ""])
+
+# Email columns are low-cardinality too; their categories grow on demand
+EMAIL_CATEGORY_COLS = ("assigned_to", "assigned_by")
+
+
+def _ensure_category(df, col, value):
+    """
+    Make `value` storable in df[col] if it is categorical: grows the email
+    categories, maps unknown statuses to "". Returns the value to store.
+    """
+    dtype = df[col].dtype
+    if not isinstance(dtype, pd.CategoricalDtype) or value in dtype.categories:
+        return value
+    if col == "status":
+        return ""
+    df[col] = df[col].cat.add_categories([value])
+    return value
+
+
+def _touch_tasks_cache():
+    """Bump the cache generation so memoised filter results are recomputed."""
+    st.session_state["tasks_cache_gen"] = st.session_state.get("tasks_cache_gen", 0) + 1
+
+
+def _set_cached_cell(df, i, col, value):
+    """df.at[i, col] = value, safe for categorical columns."""
+    df.at[i, col] = _ensure_category(df, col, value)
+    _touch_tasks_cache()
+
+
+def next_row_version():
+    """Monotonic (per session) millisecond version stamp for a written row."""
+    v = max(int(time.time() * 1000), st.session_state.get("_sheet_version", 0) + 1)
+    st.session_state["_sheet_version"] = v
+    return v
+
+
+def cell_a1(row_idx_zero_based: int, col_name: str):
+    """A1 address of a data cell (row 0 is the first row under the header)."""
+    return gspread.utils.rowcol_to_a1(row_idx_zero_based + 2, COL_IDX[col_name])
+
+
+def _as_version(v):
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return 0
 
 # ============================================================
 # Caching helpers — we keep a single authoritative cache in session
 # ============================================================
-def load_tasks_from_sheet(force_reload=False):
+def ensure_version_column():
     """
-    Load tasks into session cache. If available and not forced, return cached.
-    SAFE against broken / partially empty Google Sheet rows.
+    Add the row_version header (once per session) if the sheet predates it.
+    Never overwrites a header someone else put in that column.
     """
-    if not force_reload and "tasks_cache" in st.session_state:
-        return st.session_state["tasks_cache"]
+    if st.session_state.get("_version_col_checked"):
+        return
+    a1 = gspread.utils.rowcol_to_a1(1, COL_IDX[VERSION_COL])
+    header = sheet.acell(a1).value
+    if not header:
+        sheet.update(range_name=a1, values=[[VERSION_COL]], value_input_option="RAW")
+        get_sheet_headers.clear()
+    elif header != VERSION_COL:
+        st.error(f"Sheet column {a1} is '{header}', expected '{VERSION_COL}' (or empty).")
+        st.stop()
+    st.session_state["_version_col_checked"] = True
+
 
+def refresh_tasks_incremental():
+    """
+    Patch the session cache with only the rows changed since it was loaded.
+    Pulls the created_at + row_version columns, then batch_gets just the rows
+    whose version differs. Returns None when rows were inserted/removed
+    (positions shifted) so the caller falls back to a full reload.
+    """
+    df = st.session_state.get("tasks_cache")
+    if df is None:
+        return None
+
+    ca_col = cell_a1(0, "created_at")
+    ver_letter = gspread.utils.rowcol_to_a1(1, COL_IDX[VERSION_COL])[:-1]
+    remote = list(sheet.get(f"{ca_col}:{ver_letter}"))
+    # The API trims trailing rows that are blank in these columns (e.g. a task
+    # typed into the sheet without created_at) — pad back to the cached length
+    remote += [[]] * (len(df) - len(remote))
+
+    remote_created = [str(r[0]) if r else "" for r in remote]
+    if remote_created != [str(v) for v in df["created_at"].tolist()]:
+        return None
+
+    remote_versions = [_as_version(r[1]) if len(r) > 1 else 0 for r in remote]
+    local_versions = df[VERSION_COL].tolist()
+    changed = [i for i, (rv, lv) in enumerate(zip(remote_versions, local_versions)) if rv != lv]
+
+    if changed:
+        last_col = gspread.utils.rowcol_to_a1(1, len(COLS))[:-1]
+        ranges = [f"A{i + 2}:{last_col}{i + 2}" for i in changed]
+        for i, values in zip(changed, sheet.batch_get(ranges)):
+            row = values[0] if values else []
+            row = list(row) + [""] * (len(COLS) - len(row))
+            for c, v in zip(COLS, row):
+                _set_cached_cell(df, i, c, v)
+                if c in DERIVED_DATE_COLS:
+                    df.at[i, DERIVED_DATE_COLS[c]] = _parse_date(v, DERIVED_DATE_COLS[c])
+            df.at[i, VERSION_COL] = remote_versions[i]
+        build_index_map()
+
+    return df
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_tasks_frame():
+    """
+    Fetch + normalize the tasks sheet into a DataFrame. Shared across sessions
+    for a short TTL so cold session starts skip the Sheets round-trip and the
+    DataFrame build. st.cache_data hands every caller its own copy, so sessions
+    can mutate their cache in place. Cleared on every local write.
+    """
     # ✅ SAFETY FIX: default_blank prevents crashes
     data = sheet.get_all_records(default_blank="")
 
-    cols = COLS.copy()
+    cols = SHEET_COLS.copy()
 
     if not data:
         df = pd.DataFrame(columns=cols)
@@ -344,38 +556,137 @@ def load_tasks_from_sheet(force_reload=False):
         # Enforce strict column order
         df = df[cols].fillna("")
 
+    df[VERSION_COL] = df[VERSION_COL].map(_as_version)
+    known = df["status"].isin(STATUS_DTYPE.categories)
+    df["status"] = df["status"].where(known, "").astype(STATUS_DTYPE)
+    for c in EMAIL_CATEGORY_COLS:
+        df[c] = df[c].astype("category")
+    for src, parsed in DERIVED_DATE_COLS.items():
+        df[parsed] = _parse_dates(df[src], parsed)
+
+    # Fresh frames already have a 0..N-1 index
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        df = df.reset_index(drop=True)
+    return df
+
+
+def load_tasks_from_sheet(force_reload=False):
+    """
+    Load tasks into session cache. If available and not forced, return cached.
+    A forced reload with an existing cache pulls only the changed rows.
+    SAFE against broken / partially empty Google Sheet rows.
+    """
+    if not force_reload and "tasks_cache" in st.session_state:
+        return st.session_state["tasks_cache"]
+
+    ensure_version_column()
+
+    if "tasks_cache" in st.session_state:
+        df = refresh_tasks_incremental()
+        if df is not None:
+            return df
+
+    # An explicit reload must not be served a (up to 30s) stale shared copy
+    if force_reload:
+        fetch_tasks_frame.clear()
+
     # Store cache and rebuild index
-    st.session_state["tasks_cache"] = df.reset_index(drop=True)
+    df = fetch_tasks_frame()
+    st.session_state["tasks_cache"] = df
+    _touch_tasks_cache()
     build_index_map()
 
     return st.session_state["tasks_cache"]
 
 
+# Columns that feed build_index_map (signature keys + per-user views)
+INDEX_KEY_COLS = {"created_at", "assigned_by", "assigned_to", "task", "status"}
+
+
+def _index_row(i, created_at, assigned_by, task, status):
+    """
+    Register one row's signature keys (shared by full rebuild and append).
+    Soft-deleted rows are skipped so no lookup can resolve to one.
+    """
+    if status == DELETED_STATUS:
+        return
+    idx = st.session_state["tasks_index_map"]
+    idx[(created_at, assigned_by, task)] = i
+    idx.setdefault((created_at, assigned_by, None), i)
+    idx.setdefault((None, assigned_by, task), i)
+    st.session_state["tasks_by_created_at"].setdefault(created_at, i)
+
+
+def _index_user_row(i, assigned_by, assigned_to, status, newest=False):
+    """
+    Register one row in the per-user lists (kept newest-first).
+    Soft-deleted rows stay in the cache (positions = sheet rows) but are
+    left out of the per-user views. Blank / unknown statuses are tracked so
+    the status filter knows when "all options" really matches every row.
+    """
+    if status == DELETED_STATUS:
+        return
+    if status not in TASK_STATUSES:
+        st.session_state.setdefault("tasks_blank_status_rows", set()).add(i)
+    for key, email_val in (("tasks_by_assigned_by", assigned_by), ("tasks_by_assigned_to", assigned_to)):
+        rows = st.session_state[key].setdefault(email_val, [])
+        if newest:
+            rows.insert(0, i)
+        else:
+            rows.append(i)
+
+
 def build_index_map():
     """
     Build a dictionary to lookup row index (0-based) by signature.
     Signature uses (created_at, assigned_by, task) with safe fallbacks.
+    Also builds inverted indexes: created_at -> row (last-resort lookup) and
+    email -> [rows, newest first] for assigned_by / assigned_to (per-user views).
     """
     df = st.session_state.get("tasks_cache")
     idx = {}
+    st.session_state["tasks_index_map"] = idx
+    st.session_state["tasks_by_created_at"] = {}
+    st.session_state["tasks_by_assigned_by"] = {}
+    st.session_state["tasks_by_assigned_to"] = {}
+    st.session_state["tasks_blank_status_rows"] = set()
 
     if df is None or df.empty:
-        st.session_state["tasks_index_map"] = idx
         return idx
 
-    for i, r in df.reset_index(drop=True).iterrows():
-        created_at = r.get("created_at", "")
-        assigned_by = r.get("assigned_by", "")
-        task = r.get("task", "")
+    # Zip over raw column arrays — avoids boxing every row into a Series
+    ca = df["created_at"].to_numpy()
+    ab = df["assigned_by"].to_numpy()
+    at = df["assigned_to"].to_numpy()
+    tk = df["task"].to_numpy()
+    stt = df["status"].to_numpy()
 
-        idx[(created_at, assigned_by, task)] = i
-        idx.setdefault((created_at, assigned_by, None), i)
-        idx.setdefault((None, assigned_by, task), i)
+    for i, (created_at, assigned_by, task, status) in enumerate(zip(ca, ab, tk, stt)):
+        _index_row(i, created_at, assigned_by, task, status)
+
+    # Per-user lists are filled newest-first so the views never need a sort
+    newest_first = df["created_at"].astype(str).to_numpy().argsort(kind="stable")[::-1]
+    for i in newest_first:
+        _index_user_row(int(i), ab[i], at[i], stt[i])
 
-    st.session_state["tasks_index_map"] = idx
     return idx
 
 
+def user_task_rows(user_email):
+    """
+    Cache positions (newest first) for the two per-user views:
+    (assigned BY the user to others, assigned TO the user).
+    O(user's rows) instead of boolean masks over the whole frame.
+    """
+    to_me = st.session_state.get("tasks_by_assigned_to", {}).get(user_email, [])
+    to_me_set = set(to_me)
+    by_me = [
+        i for i in st.session_state.get("tasks_by_assigned_by", {}).get(user_email, [])
+        if i not in to_me_set
+    ]
+    return by_me, to_me
+
+
 def find_task_index_by_signature(created_at_ts, assigned_by_val, task_name):
     """
     Fast lookup using pre-built index map.
@@ -390,25 +701,33 @@ def find_task_index_by_signature(created_at_ts, assigned_by_val, task_name):
         if key in idx:
             return idx[key]
 
-    # Final fallback
-    for k, v in idx.items():
-        if k[0] == created_at_ts:
-            return v
-
-    return None
+    # Final fallback: any row with this created_at (O(1) inverted index)
+    return st.session_state.get("tasks_by_created_at", {}).get(created_at_ts)
 
 
 # ============================================================
 # Sheet update primitives (partial updates to minimize round-trips)
 # ============================================================
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_sheet_headers():
+    """
+    Header row of the tasks sheet. Static in practice, so cached for an hour
+    instead of being re-fetched on every append. Call get_sheet_headers.clear()
+    after editing the sheet schema.
+    """
+    return sheet.row_values(1)
+
+
 def append_task_to_sheet(row: dict):
     """
     SAFELY append a new row to sheet using header-based mapping.
     This GUARANTEES correct column order forever.
     """
 
-    # ✅ SOURCE OF TRUTH: read headers from sheet
-    headers = sheet.row_values(1)
+    row = {**row, VERSION_COL: next_row_version()}
+
+    # ✅ SOURCE OF TRUTH: sheet headers (cached — no extra round-trip)
+    headers = get_sheet_headers()
 
     # Build row strictly in header order
     values = [row.get(h, "") for h in headers]
@@ -417,61 +736,129 @@ def append_task_to_sheet(row: dict):
         values,
         value_input_option="USER_ENTERED"
     )
+    fetch_tasks_frame.clear()
 
     # Update local cache safely
     df = st.session_state.get("tasks_cache")
     if df is None:
         df = load_tasks_from_sheet(force_reload=True)
     else:
-        df.loc[len(df)] = values
+        new_idx = len(df)
+        for src, parsed in DERIVED_DATE_COLS.items():
+            row[parsed] = _parse_date(row.get(src, ""), parsed)
+
+        # Build the new row with the cache's dtypes so concat keeps the
+        # categorical columns categorical (df.loc enlargement upcasts to object)
+        values = [_ensure_category(df, c, row.get(c, "")) for c in CACHE_COLS]
+        new_row = pd.DataFrame([values], columns=CACHE_COLS, index=[new_idx])
+        new_row = new_row.astype(df.dtypes.to_dict())
+        df = pd.concat([df, new_row])
         st.session_state["tasks_cache"] = df
-        build_index_map()
+        _touch_tasks_cache()
+
+        # Extend the lookup indexes with just the new row (no O(N) rebuild)
+        if "tasks_index_map" not in st.session_state:
+            build_index_map()
+        else:
+            _index_row(
+                new_idx, row.get("created_at", ""), row.get("assigned_by", ""),
+                row.get("task", ""), row.get("status", ""),
+            )
+            _index_user_row(
+                new_idx, row.get("assigned_by", ""), row.get("assigned_to", ""),
+                row.get("status", ""), newest=True,
+            )
 
     return len(st.session_state["tasks_cache"]) - 1
 
 
-def update_single_cell_in_sheet(row_idx_zero_based: int, col_name: str, value):
+def apply_cell_updates(updates):
     """
-    Update a single cell (safe, minimal payload).
+    Write many cells in ONE batch_update round-trip.
+    updates: list of (row_idx_zero_based, col_name, value)
     """
-    row_num = row_idx_zero_based + 2  # header offset
-    col_num = COL_IDX[col_name]
+    if not updates:
+        return
+
+    body = [
+        {"range": cell_a1(row_idx, col_name), "values": [[value]]}
+        for row_idx, col_name, value in updates
+    ]
+    sheet.batch_update(body, value_input_option="USER_ENTERED")
+    fetch_tasks_frame.clear()
 
-    sheet.update_cell(row_num, col_num, value)
 
-    # Reflect in cache
+@contextmanager
+def batched_writes():
+    """
+    Collect update_single_cell_in_sheet / log_audit calls made inside the
+    block and flush the cells as a single batch_update on exit. The cache
+    edits and audit events are applied only once that write succeeds — if it
+    raises (e.g. 429 quota), cache and audit log are left untouched. The
+    lookup indexes are rebuilt once instead of once per cell.
+    """
+    _write_batch.pending = []
+    _write_batch.cache_edits = []
+    _write_batch.audit = []
+    try:
+        yield
+        apply_cell_updates(_write_batch.pending)
+        cache_edits, audit = _write_batch.cache_edits, _write_batch.audit
+    finally:
+        _write_batch.pending = _write_batch.cache_edits = _write_batch.audit = None
+
+    if any([_reflect_cell_in_cache(*edit) for edit in cache_edits]):
+        build_index_map()
+    if audit:
+        _buffer_audit_events(audit)
+
+
+def _reflect_cell_in_cache(row_idx_zero_based, col_name, value, version):
+    """Apply a written cell to the session cache; True if the indexes need a rebuild."""
     df = st.session_state.get("tasks_cache")
-    if df is not None and row_idx_zero_based < len(df):
-        df.at[row_idx_zero_based, col_name] = value
-        st.session_state["tasks_cache"] = df
+    if df is None or row_idx_zero_based >= len(df):
+        return False
+    _set_cached_cell(df, row_idx_zero_based, col_name, value)
+    df.at[row_idx_zero_based, VERSION_COL] = version
+    if col_name in DERIVED_DATE_COLS:
+        parsed = DERIVED_DATE_COLS[col_name]
+        df.at[row_idx_zero_based, parsed] = _parse_date(value, parsed)
+
+    # Only key columns affect the lookup indexes (description/due_date don't)
+    return col_name in INDEX_KEY_COLS
+
+
+def update_single_cell_in_sheet(row_idx_zero_based: int, col_name: str, value):
+    """
+    Update a single cell (safe, minimal payload) and stamp the row version.
+    Inside batched_writes() the sheet write — and the cache update that
+    follows it — is deferred to the batch flush.
+    """
+    version = next_row_version()
+    cells = [
+        (row_idx_zero_based, col_name, value),
+        (row_idx_zero_based, VERSION_COL, version),
+    ]
+
+    pending = getattr(_write_batch, "pending", None)
+    if pending is not None:
+        pending.extend(cells)
+        _write_batch.cache_edits.append((row_idx_zero_based, col_name, value, version))
+        return
+
+    apply_cell_updates(cells)
+    if _reflect_cell_in_cache(row_idx_zero_based, col_name, value, version):
         build_index_map()
 
 
 def delete_row_in_sheet(row_idx_zero_based: int):
     """
-    Delete a row safely and sync cache.
+    Soft-delete: flag the row's status as Deleted (one small cell write).
+    Row positions stay stable, so no full-sheet rewrite is ever needed and
+    other sessions' caches stay aligned.
     """
-    row_num = row_idx_zero_based + 2
-
-    try:
-        sheet.delete_rows(row_num)
-    except Exception:
-        # Rare fallback: rewrite entire sheet safely
-        df = st.session_state.get("tasks_cache")
-        if df is not None:
-            df2 = df.drop(index=row_idx_zero_based).reset_index(drop=True)
-            sheet.clear()
-            sheet.update([COLS] + df2.values.tolist())
-            st.session_state["tasks_cache"] = df2
-            build_index_map()
-            return
+    update_single_cell_in_sheet(row_idx_zero_based, "status", DELETED_STATUS)
 
-    # Update cache
-    df = st.session_state.get("tasks_cache")
-    if df is not None:
-        df2 = df.drop(index=row_idx_zero_based).reset_index(drop=True)
-        st.session_state["tasks_cache"] = df2
-        build_index_map()
 
 # ============================================================
 # Google OAuth Helpers (unchanged)
@@ -482,6 +869,9 @@ SCOPES = ["openid",
 
 
 def build_flow():
+    # Imported lazily — only needed on the login / OAuth callback path
+    from google_auth_oauthlib.flow import Flow
+
     cfg = {
         "web": {
             "client_id": CLIENT_ID,
@@ -568,6 +958,11 @@ if "logged_in" not in st.session_state:
 params = dict(st.query_params)
 
 if "code" in params and not st.session_state.logged_in:
+    # OAuth callback only — keep these heavy imports off the normal rerun path
+    from urllib.parse import urlencode
+    from google.oauth2 import id_token
+    from google.auth.transport import requests
+
     try:
         f = build_flow()
         full = REDIRECT_URI + "?" + urlencode(params)
@@ -604,15 +999,9 @@ if "code" in params and not st.session_state.logged_in:
 # ============================
 if not st.session_state.logged_in:
 
-    import base64
-
-    def load_base64(path):
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-
     logo_html = ""
-    if os.path.exists("logo2.png"):
-        b64 = load_base64("logo2.png")
+    b64 = load_base64_image("logo2.png")
+    if b64:
         logo_html = f"<img src='data:image/png;base64,{b64}' class='login-logo' />"
 
     login_html = f"""
@@ -751,15 +1140,8 @@ if not st.session_state.logged_in:
 # ============================================================
 
 # Load sidebar icon
-USER_ICON_BASE64 = None
-if os.path.exists("icon2.png"):
-    with open("icon2.png", "rb") as f:
-        USER_ICON_BASE64 = base64.b64encode(f.read()).decode()
-
-TABLE_ICON_BASE64 = None
-if os.path.exists("table.png"):
-    with open("table.png", "rb") as f:
-        TABLE_ICON_BASE64 = base64.b64encode(f.read()).decode()
+USER_ICON_BASE64 = load_base64_image("icon2.png")
+TABLE_ICON_BASE64 = load_base64_image("table.png")
 
 
 # ===========================
@@ -823,19 +1205,23 @@ dashboard_view = st.sidebar.radio(
     key="sidebar_dashboard_view"
 )
 
+# Per-user row indexes (built with the cache) — O(user's rows) instead of O(N) masks
+rows_by_me, rows_to_me = user_task_rows(email)
+
 # VIEW 1 → Tasks Assigned
 if dashboard_view == "Tasks Assigned":
-    df_view = df_all[(df_all["assigned_by"] == email) & (df_all["assigned_to"] != email)]
+    df_view = df_all.iloc[rows_by_me]
 
 # VIEW 2 → Your Tasks
 else:
-    df_view = df_all[df_all["assigned_to"] == email]
+    df_view = df_all.iloc[rows_to_me]
 
 # Stats
 total_tasks = len(df_view)
-completed_tasks = (df_view["status"] == "Completed").sum()
-inprogress_tasks = (df_view["status"] == "In-Progress").sum()
-pending_tasks = (df_view["status"] == "Pending").sum()
+status_counts = df_view["status"].value_counts()  # single pass over the column
+completed_tasks = int(status_counts.get("Completed", 0))
+inprogress_tasks = int(status_counts.get("In-Progress", 0))
+pending_tasks = int(status_counts.get("Pending", 0))
 progress_percent = int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
 
 # Sidebar card
@@ -854,9 +1240,18 @@ st.sidebar.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
+# Refresh button — the only re-read of the sheet after the first load, and
+# incremental: only rows whose row_version changed are re-downloaded
+if st.sidebar.button("Refresh tasks"):
+    with st.spinner("Refreshing tasks..."):
+        load_tasks_from_sheet(force_reload=True)
+    st.rerun()
+
 # Logout button
 if st.sidebar.button("Log out"):
-    for k in ["tasks_cache", "tasks_index_map", "edited_assigned_tasks", "edited_tasks"]:
+    for k in ["tasks_cache", "tasks_index_map", "tasks_by_created_at",
+              "tasks_by_assigned_by", "tasks_by_assigned_to", "tasks_blank_status_rows",
+              "_assigned_filtered", "_your_filtered"]:
         st.session_state.pop(k, None)
     st.session_state.logged_in = False
     st.query_params.clear()
@@ -865,10 +1260,8 @@ if st.sidebar.button("Log out"):
 # ============================================================
 # SIDEBAR FOOTER — FIXED, BOTTOM CENTER INSIDE SIDEBAR
 # ============================================================
-if os.path.exists("logo.png"):
-    with open("logo.png", "rb") as f:
-        b64_logo = base64.b64encode(f.read()).decode()
-
+b64_logo = load_base64_image("logo.png")
+if b64_logo:
     with st.sidebar:
         st.markdown(f"""
         <div class="sidebar-footer">
@@ -910,65 +1303,172 @@ tasks = load_tasks_from_sheet()
 # ============================================================
 # ASSIGN NEW TASK
 # ============================================================
-st.subheader("Create New Task")
-title = st.text_input("Task Title", key="new_task_title")
-desc = st.text_area("Description", key="new_task_desc")
-assign_to_input = st.text_input("Assign To (email)", key="new_task_assign")
-due_date = st.date_input("Due Date (Optional)", value=None, key="new_task_due")
+def create_task_callback():
+    """
+    on_click handler for Create Task. Streamlit runs callbacks BEFORE the
+    script pass, so the page (sidebar counts, tables) renders once with the
+    new task already in the cache — no extra st.rerun() needed.
+    """
+    title = st.session_state.get("new_task_title", "")
+    assign_to = (st.session_state.get("new_task_assign") or "").strip().lower()
+    due_date = st.session_state.get("new_task_due")
+    user_email = st.session_state.email
 
-if st.button("Create Task", key="create_task_btn"):
-    assign_to = (assign_to_input or "").strip().lower()
     if not title.strip() or "@med-x.ai" not in assign_to:
-        st.error("Enter valid title + company email.")
-    else:
-        # No assignment restriction anymore
-        new = {
-            "task": title,
-            "description": desc,
-            "assigned_to": assign_to,
-            "assigned_by": email,
-            "due_date": str(due_date) if due_date else "",
-            "status": "Pending",
-            "created_at": datetime.now().isoformat()
-        }
+        st.session_state["_create_task_error"] = "Enter valid title + company email."
+        return
+
+    # No assignment restriction anymore
+    new = {
+        "task": title,
+        "description": st.session_state.get("new_task_desc", ""),
+        "assigned_to": assign_to,
+        "assigned_by": user_email,
+        "due_date": str(due_date) if due_date else "",
+        "status": "Pending",
+        "created_at": datetime.now().isoformat()
+    }
 
-        # append to sheet (partial update) and update cache
-        with st.spinner("Creating task..."):
-            new_idx = append_task_to_sheet(new)
-            log_audit("created", title, email, "", f"assigned_to={assign_to}")
+    # append to sheet (partial update) and update cache
+    with st.spinner("Creating task..."):
+        append_task_to_sheet(new)
+        log_audit("created", title, user_email, "", f"assigned_to={assign_to}")
 
-            # clear any editor session copies and rebuild on next render
-            st.session_state.pop("edited_assigned_tasks", None)
-            st.session_state.pop("edited_tasks", None)
+    # Reset the form (allowed here because widgets aren't instantiated yet)
+    st.session_state["new_task_title"] = ""
+    st.session_state["new_task_desc"] = ""
+    st.session_state["new_task_assign"] = ""
+    st.session_state["new_task_due"] = None
+    st.session_state["_create_task_done"] = True
 
-        show_toast("Task created successfully!", tone="info", icon="🎉")
-        st.rerun()
+
+st.subheader("Create New Task")
+st.text_input("Task Title", key="new_task_title")
+st.text_area("Description", key="new_task_desc")
+st.text_input("Assign To (email)", key="new_task_assign")
+st.date_input("Due Date (Optional)", value=None, key="new_task_due")
+
+st.button("Create Task", key="create_task_btn", on_click=create_task_callback)
+
+create_error = st.session_state.pop("_create_task_error", None)
+if create_error:
+    st.error(create_error)
+if st.session_state.pop("_create_task_done", False):
+    show_toast("Task created successfully!", tone="info", icon="🎉")
 
 # ============================================================
 # UTILS
 # ============================================================
-def is_overdue_vec(due_series, status_series):
-    """Vectorized overdue check for speed."""
-    try:
-        due_dates = pd.to_datetime(due_series, errors='coerce').dt.date
-        today = date.today()
-        return (due_dates.notna()) & (status_series != "Completed") & (due_dates < today)
-    except Exception:
-        return pd.Series([False] * len(due_series))
+def is_overdue_vec(due_dates, status_series):
+    """Vectorized overdue check on the pre-parsed due_date_parsed column."""
+    today = date.today()
+    return due_dates.notna() & (status_series != "Completed") & (due_dates < today)
+
+def filter_tasks(frame, status_filter, date_filter, overdue_only, start_date, end_date):
+    """
+    Apply the filter bar to a task frame: every predicate is ANDed into ONE
+    boolean mask and the frame is indexed once (no intermediate copies).
+    """
+    # Selecting every option filters nothing unless some row has a blank /
+    # unknown status (rare) — skip the pass
+    if set(status_filter) >= set(TASK_STATUSES) and not st.session_state.get("tasks_blank_status_rows"):
+        mask = np.ones(len(frame), dtype=bool)
+    else:
+        # Compare the int8 category codes directly (no per-value string work)
+        allowed = [STATUS_DTYPE.categories.get_loc(s) for s in status_filter]
+        mask = np.isin(frame["status"].cat.codes.to_numpy(), allowed)
 
-def created_date_only(ts):
-    if not ts:
+    # Overdue filter
+    if overdue_only:
+        mask &= is_overdue_vec(frame["due_date_parsed"], frame["status"]).to_numpy()
+
+    # Date filtering → inclusive [lo, hi] bounds on the created_at day numbers
+    today = date.today()
+    lo = hi = None
+
+    if date_filter == "This Week":
+        lo = today - timedelta(days=today.weekday())
+
+    elif date_filter == "Last Week":
+        lo = today - timedelta(days=today.weekday() + 7)
+        hi = lo + timedelta(days=6)
+
+    elif date_filter == "This Month":
+        lo = today.replace(day=1)
+
+    elif date_filter == "Last Month":
+        first_this_month = today.replace(day=1)
+        hi = first_this_month - timedelta(days=1)
+        lo = hi.replace(day=1)
+
+    elif date_filter == "Custom" and start_date and end_date:
+        lo, hi = start_date, end_date
+
+    if lo is not None or hi is not None:
+        days = frame[CREATED_DAY_COL].to_numpy()
+        mask &= days != NAT_DAY
+        if lo is not None:
+            mask &= days >= day_number(lo)
+        if hi is not None:
+            mask &= days <= day_number(hi)
+
+    return frame.loc[mask]
+
+
+def filtered_task_rows(memo_key, rows, status_filter, date_filter, overdue_only, start_date, end_date):
+    """
+    filter_tasks over the given per-user rows, reset to a 0..N-1 index.
+    Memoised in session_state on the filter inputs + cache generation, so
+    pagination clicks (full reruns) don't re-run the filter pass.
+    """
+    sig = (
+        st.session_state.get("tasks_cache_gen", 0), date.today(), tuple(rows),
+        tuple(status_filter), date_filter, overdue_only, start_date, end_date,
+    )
+    hit = st.session_state.get(memo_key)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+
+    frame = filter_tasks(
+        st.session_state["tasks_cache"].iloc[rows],
+        status_filter, date_filter, overdue_only, start_date, end_date,
+    ).reset_index(drop=True)
+    st.session_state[memo_key] = (sig, frame)
+    return frame
+
+
+def due_to_iso(v):
+    """Editor Due Date cell (date / Timestamp / ISO str / None) -> 'YYYY-MM-DD' or ''."""
+    if isinstance(v, str):
+        v = _parse_date(v, "due_date_parsed")
+    if v is None or pd.isna(v):
         return ""
-    try:
-        base = str(ts).split("T")[0].split(" ")[0]
-        # quick validation
-        _ = datetime.fromisoformat(base) if "-" in base and len(base.split("-")) == 3 else None
-        return base
-    except Exception:
-        try:
-            return str(ts).split(" ")[0]
-        except Exception:
-            return str(ts)
+    if isinstance(v, datetime):
+        v = v.date()
+    return v.isoformat() if isinstance(v, date) else ""
+
+
+def created_date_only_vec(created_series):
+    """Vectorized date part of created_at ('2024-05-01T10:00:00' -> '2024-05-01')."""
+    return (
+        created_series.astype(str)
+        .str.split("T", n=1).str[0]
+        .str.split(" ", n=1).str[0]
+    )
+
+def style_completed(view):
+    """
+    Green highlight for completed status, computed server-side via Styler
+    (replaces the non-standard CSS :contains() selector). data_editor only
+    styles non-editable columns, so this is for tables with a read-only Status.
+    """
+    def _cell(v):
+        return "color:#10b981; font-weight:600" if v == "Completed" else ""
+
+    styler = view.style
+    # Styler.applymap was renamed to Styler.map in pandas 2.1
+    style_fn = getattr(styler, "map", None) or styler.applymap
+    return style_fn(_cell, subset=["Status"])
 
 # ============================================================
 # HELPER: PAGINATION FOR TABLES
@@ -1027,7 +1527,7 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     status_filter = st.multiselect(
         "Status",
-        ["Pending", "In-Progress", "Completed"],
+        TASK_STATUSES,
         default=["Pending", "In-Progress"],  # Default: do NOT show completed
         key="assigned_status_filter"
     )
@@ -1057,81 +1557,34 @@ with col4:
 # ---------------------------
 # APPLY FILTERS
 # ---------------------------
-assigned_by_me = tasks[(tasks["assigned_by"] == email) & (tasks["assigned_to"] != email)].copy()
-
-if not assigned_by_me.empty:
+# Per-user rows come newest-first from the index → no mask over all tasks, no sort
+assigned_rows, _ = user_task_rows(email)
 
-    assigned_by_me["created_at_date"] = pd.to_datetime(
-        assigned_by_me["created_at"], errors="coerce"
-    ).dt.date
-
-    # Status filter
-    assigned_by_me = assigned_by_me[assigned_by_me["status"].isin(status_filter)]
-
-    # Overdue filter
-    if overdue_only:
-        assigned_by_me = assigned_by_me[
-            is_overdue_vec(assigned_by_me["due_date"], assigned_by_me["status"])
-        ]
-
-    # Date filtering
-    today = date.today()
-
-    if date_filter == "This Week":
-        week_start = today - pd.to_timedelta(today.weekday(), unit="day")
-        assigned_by_me = assigned_by_me[assigned_by_me["created_at_date"] >= week_start]
+if assigned_rows:
 
-    elif date_filter == "Last Week":
-        last_week_start = today - pd.to_timedelta(today.weekday() + 7, unit="day")
-        last_week_end = last_week_start + pd.to_timedelta(6, unit="day")
-        assigned_by_me = assigned_by_me[
-            (assigned_by_me["created_at_date"] >= last_week_start) &
-            (assigned_by_me["created_at_date"] <= last_week_end)
-        ]
-
-    elif date_filter == "This Month":
-        month_start = today.replace(day=1)
-        assigned_by_me = assigned_by_me[assigned_by_me["created_at_date"] >= month_start]
-
-    elif date_filter == "Last Month":
-        first_this_month = today.replace(day=1)
-        last_month_end = first_this_month - pd.to_timedelta(1, unit="day")
-        last_month_start = last_month_end.replace(day=1)
-        assigned_by_me = assigned_by_me[
-            (assigned_by_me["created_at_date"] >= last_month_start) &
-            (assigned_by_me["created_at_date"] <= last_month_end)
-        ]
-
-    elif date_filter == "Custom" and start_date and end_date:
-        assigned_by_me = assigned_by_me[
-            (assigned_by_me["created_at_date"] >= start_date) &
-            (assigned_by_me["created_at_date"] <= end_date)
-        ]
-
-    # Sort newest first
-    assigned_by_me = assigned_by_me.sort_values("created_at", ascending=False).reset_index(drop=True)
+    # Already newest first (per-user index order)
+    assigned_by_me = filtered_task_rows(
+        "_assigned_filtered", assigned_rows,
+        status_filter, date_filter, overdue_only, start_date, end_date,
+    )
 
-    # Create display columns
-    assigned_by_me["Serial No"] = range(1, len(assigned_by_me) + 1)
-    assigned_by_me["Created At (display)"] = assigned_by_me["created_at"].apply(created_date_only)
+    # ---------------------------
+    # PAGINATION (10 rows) — display columns are built for this page only
+    # ---------------------------
+    page = paginate_dataframe(assigned_by_me, "assigned_tasks", rows_per_page=10)
 
-    def to_date_obj(s):
-        if not s:
-            return None
-        try:
-            return datetime.strptime(s, "%Y-%m-%d").date()
-        except:
-            try:
-                return pd.to_datetime(s).date()
-            except:
-                return None
+    # Create display columns (index = position in the filtered list)
+    page["Serial No"] = page.index + 1
+    page["Created At (display)"] = created_date_only_vec(page["created_at"])
 
-    assigned_by_me["Due Date"] = assigned_by_me["due_date"].apply(to_date_obj)
-    assigned_by_me["Delete"] = "No"
-    assigned_by_me["Status"] = assigned_by_me["status"]
+    # Pre-parsed on ingest; None (not NaT) for blanks so DateColumn shows empty
+    due_parsed = page["due_date_parsed"]
+    page["Due Date"] = due_parsed.where(due_parsed.notna(), None)
+    page["Delete"] = "No"
+    page["Status"] = page["status"]
 
     # Remove "Overdue" column completely
-    view = assigned_by_me[[
+    paginated_view = page[[
         "Serial No",
         "task",
         "description",
@@ -1140,31 +1593,28 @@ if not assigned_by_me.empty:
         "Created At (display)",
         "Due Date",
         "Delete"
-    ]].copy()
+    ]]
 
-    view.rename(columns={
+    paginated_view.rename(columns={
         "task": "Task",
         "description": "Description",
         "assigned_to": "Assigned To",
         "Created At (display)": "Created At"
     }, inplace=True)
 
-    # Save for row tracking
-    created_at_internal = assigned_by_me["created_at"].tolist()
+    # Editable cells must accept any value — hand the editor plain strings,
+    # not the cache's categorical columns
+    paginated_view = paginated_view.astype({"Status": object, "Assigned To": object})
 
-    # ---------------------------
-    # PAGINATION (10 rows)
-    # ---------------------------
-    paginated_view = paginate_dataframe(view, "assigned_tasks", rows_per_page=10)
-
-    st.session_state["edited_assigned_tasks"] = paginated_view.copy()
+    # Save for row tracking (aligned with the rows shown on this page)
+    created_at_internal = page["created_at"].tolist()
 
     # ⭐ FULLSCREEN WRAPPER ⭐
     with st.container():
         st.markdown('<div class="stDataFrameFullscreen">', unsafe_allow_html=True)
 
         edited = st.data_editor(
-            st.session_state["edited_assigned_tasks"],
+            style_completed(paginated_view),
             use_container_width=True,
             num_rows="fixed",
             hide_index=True,
@@ -1183,51 +1633,20 @@ if not assigned_by_me.empty:
 
         st.markdown("</div>", unsafe_allow_html=True)
 
-    # ⭐ NEW FIX: REAL EXIT FULLSCREEN BUTTON ⭐
-    st.markdown(
-        """
-        <script>
-        function attachExitBtn() {
-            const fs = document.querySelector("div[data-testid='stElementFullscreen']");
-            if (!fs) return;
-
-            if (fs.querySelector("#exitFS")) return;
-
-            const btn = document.createElement("button");
-            btn.innerText = "Exit Fullscreen";
-            btn.id = "exitFS";
-            btn.style.position = "absolute";
-            btn.style.top = "10px";
-            btn.style.right = "15px";
-            btn.style.padding = "6px 10px";
-            btn.style.zIndex = "99999";
-            btn.style.background = "#1e293b";
-            btn.style.color = "white";
-            btn.style.border = "1px solid #334155";
-            btn.style.borderRadius = "6px";
-            btn.onclick = () => fs.click();
-
-            fs.appendChild(btn);
-        }
-
-        setInterval(attachExitBtn, 500);
-        </script>
-        """,
-        unsafe_allow_html=True,
-    )
-
     # ---------------------------
-    # SAVE LOGIC (unchanged)
+    # SAVE LOGIC — vectorized diff, one batch_update for the whole save
     # ---------------------------
     if st.button("💾 Save Assigned Tasks", key="save_assigned_tasks_btn"):
         deletions = []
         updates = []
         errors = []
 
-        for i in range(len(edited)):
-            created_at_ts = created_at_internal[i]
-            task_display_name = edited.iloc[i]["Task"]
+        # Resolve each edited row to its cache position (O(1) signature lookups)
+        keep_rows = []   # positions in `edited` still to diff
+        keep_idx = []    # matching cache positions
+        rows = zip(created_at_internal, edited["Task"].tolist(), edited["Delete"].tolist())
 
+        for row_no, (created_at_ts, task_display_name, delete_flag) in enumerate(rows):
             found_idx = find_task_index_by_signature(
                 created_at_ts, email, task_display_name
             )
@@ -1236,65 +1655,59 @@ if not assigned_by_me.empty:
                 errors.append(f"Could not find row for '{task_display_name}', skipping.")
                 continue
 
-            original = st.session_state["tasks_cache"].iloc[found_idx]
-
             # DELETE
-            if edited.iloc[i]["Delete"] == "Yes":
+            if delete_flag == "Yes":
                 deletions.append(found_idx)
                 continue
 
-            # REASSIGN
-            new_assigned_to = str(edited.iloc[i]["Assigned To"]).strip().lower()
-            if new_assigned_to != original["assigned_to"]:
-                if "@med-x.ai" not in new_assigned_to:
-                    errors.append(f"Invalid email: {new_assigned_to}")
-                else:
-                    updates.append(("assigned_to", found_idx, original["assigned_to"], new_assigned_to, task_display_name))
-
-            # TITLE
-            if edited.iloc[i]["Task"] != original["task"]:
-                updates.append(("task", found_idx, original["task"], edited.iloc[i]["Task"], original["task"]))
-
-            # DESCRIPTION
-            if edited.iloc[i]["Description"] != original["description"]:
-                updates.append(("description", found_idx, original["description"], edited.iloc[i]["Description"], original["task"]))
-
-            # DUE DATE
-            orig_due = original.get("due_date", "") or ""
-            new_due_obj = edited.iloc[i]["Due Date"]
-            new_due_str = new_due_obj.isoformat() if isinstance(new_due_obj, date) else ""
-            if new_due_str != orig_due:
-                updates.append(("due_date", found_idx, orig_due, new_due_str, original["task"]))
-
-        # Deletions
-        if deletions:
-            with st.spinner("Deleting rows..."):
-                for ridx in sorted(set(deletions), reverse=True):
+            keep_rows.append(row_no)
+            keep_idx.append(found_idx)
+
+        # Vectorized change detection: one elementwise compare per field,
+        # then Python only touches the cells that actually changed
+        if keep_rows:
+            ed = edited.iloc[keep_rows]
+            orig = st.session_state["tasks_cache"].iloc[keep_idx]
+            orig_tasks = orig["task"].to_numpy(dtype=object)
+
+            new_values = {
+                # REASSIGN / TITLE / DESCRIPTION / DUE DATE
+                "assigned_to": ed["Assigned To"].astype(str).str.strip().str.lower().to_numpy(dtype=object),
+                "task": ed["Task"].to_numpy(dtype=object),
+                "description": ed["Description"].to_numpy(dtype=object),
+                "due_date": np.array([due_to_iso(v) for v in ed["Due Date"].tolist()], dtype=object),
+            }
+
+            for field, new_vals in new_values.items():
+                old_vals = orig[field].to_numpy(dtype=object)
+                cmp_vals = old_vals
+                if field == "due_date":
+                    # The editor only holds parsed dates: diff against the
+                    # normalised stored date, so an untouched cell never
+                    # rewrites the raw sheet string (or wipes an odd format)
+                    cmp_vals = np.array([due_to_iso(v) for v in orig["due_date_parsed"].tolist()], dtype=object)
+
+                for k in np.flatnonzero(new_vals != cmp_vals):
+                    if field == "assigned_to" and "@med-x.ai" not in new_vals[k]:
+                        errors.append(f"Invalid email: {new_vals[k]}")
+                        continue
+                    updates.append((field, keep_idx[k], old_vals[k], new_vals[k], orig_tasks[k]))
+
+        # Deletions + updates → ONE batch_update round-trip.
+        # Soft deletes keep row positions stable, so the indexes found above
+        # stay valid for the updates (no re-lookup needed).
+        change_count = 0
+        if deletions or updates:
+            with st.spinner("Saving changes..."), batched_writes():
+                for ridx in sorted(set(deletions)):
                     task_name = st.session_state["tasks_cache"].at[ridx, "task"]
                     delete_row_in_sheet(ridx)
                     log_audit("deleted", task_name, email, "", "")
 
-        # Updates
-        change_count = 0
-        if updates:
-            with st.spinner("Saving changes..."):
-                for field, orig_idx, oldv, newv, task_ref in updates:
-
-                    found_idx = find_task_index_by_signature(
-                        st.session_state["tasks_cache"].at[orig_idx, "created_at"],
-                        email,
-                        task_ref
-                    )
-                    if found_idx is None:
-                        found_idx = orig_idx
-
-                    update_single_cell_in_sheet(found_idx, field, newv)
+                for field, row_idx, oldv, newv, task_ref in updates:
+                    update_single_cell_in_sheet(row_idx, field, newv)
                     change_count += 1
 
-        if change_count > 0 or deletions:
-            st.session_state.pop("edited_assigned_tasks", None)
-            st.session_state.pop("edited_tasks", None)
-
         if errors:
             for e in errors:
                 st.error(e)
@@ -1332,7 +1745,7 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     status_filter = st.multiselect(
         "Status",
-        ["Pending", "In-Progress", "Completed"],
+        TASK_STATUSES,
         default=["Pending", "In-Progress"],  # completed NOT shown by default
         key="your_status_filter"
     )
@@ -1363,66 +1776,36 @@ with col4:
 # --------------------------------------------------
 # FILTER DATA
 # --------------------------------------------------
-df = tasks[tasks["assigned_to"] == email].copy()
+_, your_rows = user_task_rows(email)
 
-if df.empty:
+if not your_rows:
     st.info("No tasks assigned to you.")
 else:
 
-    df["created_at_date"] = pd.to_datetime(df["created_at"], errors="coerce").dt.date
-
-    # Status filter
-    df = df[df["status"].isin(status_filter)]
-
-    # Overdue filter
-    if overdue_only:
-        df = df[is_overdue_vec(df["due_date"], df["status"])]
-
-    today = date.today()
-
-    # Date filtering
-    if date_filter == "This Week":
-        week_start = today - pd.to_timedelta(today.weekday(), unit="day")
-        df = df[df["created_at_date"] >= week_start]
-
-    elif date_filter == "Last Week":
-        last_week_start = today - pd.to_timedelta(today.weekday() + 7, unit="day")
-        last_week_end = last_week_start + pd.to_timedelta(6, unit="day")
-        df = df[
-            (df["created_at_date"] >= last_week_start) &
-            (df["created_at_date"] <= last_week_end)
-        ]
-
-    elif date_filter == "This Month":
-        month_start = today.replace(day=1)
-        df = df[df["created_at_date"] >= month_start]
-
-    elif date_filter == "Last Month":
-        first_this_month = today.replace(day=1)
-        last_month_end = first_this_month - pd.to_timedelta(1, unit="day")
-        last_month_start = last_month_end.replace(day=1)
-        df = df[
-            (df["created_at_date"] >= last_month_start) &
-            (df["created_at_date"] <= last_month_end)
-        ]
-
-    elif date_filter == "Custom" and start_date and end_date:
-        df = df[
-            (df["created_at_date"] >= start_date) &
-            (df["created_at_date"] <= end_date)
-        ]
-
-    # Sort newest → oldest
-    df = df.sort_values("created_at", ascending=False).reset_index(drop=True)
+    # Already newest → oldest (per-user index order)
+    df = filtered_task_rows(
+        "_your_filtered", your_rows,
+        status_filter, date_filter, overdue_only, start_date, end_date,
+    )
 
-    # Create display columns
-    df["Serial No"] = range(1, len(df) + 1)
-    df["Created At (display)"] = df["created_at"].apply(created_date_only)
-    df["Due Date"] = df["due_date"].replace("", "—")
-    df["Delete"] = "No"
+    # ---------------------------
+    # PAGINATION (10 rows per page) — display columns for this page only
+    # ---------------------------
+    page = paginate_dataframe(df, "your_tasks", rows_per_page=10)
+
+    # Create display columns (index = position in the filtered list)
+    page["Serial No"] = page.index + 1
+    page["Created At (display)"] = created_date_only_vec(page["created_at"])
+    # Same pre-parsed dates as the Assigned table, one vectorized strftime;
+    # unparseable strings are shown verbatim, blanks as "—"
+    page["Due Date"] = (
+        pd.to_datetime(page["due_date_parsed"]).dt.strftime("%Y-%m-%d")
+        .fillna(page["due_date"]).replace("", "—")
+    )
+    page["Delete"] = "No"
 
     # FINAL TABLE — **WITHOUT Overdue column**
-    view = df[[
+    paginated_view = page[[
         "Serial No",
         "task",
         "description",
@@ -1431,9 +1814,9 @@ else:
         "Created At (display)",
         "Due Date",
         "Delete"
-    ]].copy()
+    ]]
 
-    view.rename(columns={
+    paginated_view.rename(columns={
         "task": "Task",
         "description": "Description",
         "status": "Status",
@@ -1441,21 +1824,17 @@ else:
         "Created At (display)": "Created At"
     }, inplace=True)
 
-    created_at_internal_for_assignee = df["created_at"].tolist()
+    # Plain strings for the editor (cache columns are categorical)
+    paginated_view = paginated_view.astype({"Status": object, "Assigned By": object})
 
-    # ---------------------------
-    # PAGINATION (10 rows per page)
-    # ---------------------------
-    paginated_view = paginate_dataframe(view, "your_tasks", rows_per_page=10)
-
-    st.session_state["edited_tasks"] = paginated_view.copy()
+    created_at_internal_for_assignee = page["created_at"].tolist()
 
     # ⭐ FULLSCREEN WRAPPER ⭐
     with st.container():
         st.markdown('<div class="stDataFrameFullscreen">', unsafe_allow_html=True)
 
         edited = st.data_editor(
-            st.session_state["edited_tasks"],
+            paginated_view,
             use_container_width=True,
             hide_index=True,
             num_rows="fixed",
@@ -1465,7 +1844,7 @@ else:
                 "Task": st.column_config.TextColumn("Task", disabled=True),
                 "Description": st.column_config.TextColumn("Description", disabled=True),
                 "Status": st.column_config.SelectboxColumn(
-                    "Status", options=["Pending", "In-Progress", "Completed"]
+                    "Status", options=TASK_STATUSES
                 ),
                 "Assigned By": st.column_config.TextColumn("Assigned By", disabled=True),
                 "Created At": st.column_config.TextColumn("Created At", disabled=True),
@@ -1476,91 +1855,60 @@ else:
 
         st.markdown("</div>", unsafe_allow_html=True)
 
-    # ⭐ NEW FULLSCREEN EXIT BUTTON ⭐
-    st.markdown(
-        """
-        <script>
-        function addExitFS() {
-            const fs = document.querySelector("div[data-testid='stElementFullscreen']");
-            if (!fs) return;
-            if (fs.querySelector("#exitFS")) return;
-
-            const btn = document.createElement("button");
-            btn.id = "exitFS";
-            btn.innerText = "Exit Fullscreen";
-            btn.style.position = "absolute";
-            btn.style.top = "10px";
-            btn.style.right = "15px";
-            btn.style.padding = "6px 10px";
-            btn.style.zIndex = "99999";
-            btn.style.background = "#1e293b";
-            btn.style.color = "white";
-            btn.style.border = "1px solid #334155";
-            btn.style.borderRadius = "6px";
-
-            btn.onclick = () => fs.click();
-            fs.appendChild(btn);
-        }
-
-        setInterval(addExitFS, 500);
-        </script>
-        """,
-        unsafe_allow_html=True,
-    )
-
     # --------------------------------------------------------
-    # SAVE LOGIC  (unchanged)
+    # SAVE LOGIC — status changes + deletions in one batch_update
     # --------------------------------------------------------
     if st.button("💾 Save Your Tasks", key="save_your_tasks_btn"):
         changes = 0
         deletions = []
         errors = []
 
-        for i in range(len(edited)):
-            created_at_ts = created_at_internal_for_assignee[i]
-            task_display_name = edited.iloc[i]["Task"]
-            assigned_by_val = edited.iloc[i]["Assigned By"]
-
-            found_idx = find_task_index_by_signature(
-                created_at_ts, assigned_by_val, task_display_name
+        # Status changes + deletions are flushed together in one batch_update
+        with st.spinner("Saving changes..."), batched_writes():
+            # Pull each edited column out once — no per-row .iloc Series boxing
+            rows = zip(
+                created_at_internal_for_assignee,
+                edited["Task"].to_numpy(),
+                edited["Assigned By"].to_numpy(),
+                edited["Status"].to_numpy(),
+                edited["Delete"].to_numpy(),
             )
 
-            if found_idx is None:
-                errors.append(f"Could not find row for '{task_display_name}', skipping.")
-                continue
+            for created_at_ts, task_display_name, assigned_by_val, new_status, delete_flag in rows:
+                found_idx = find_task_index_by_signature(
+                    created_at_ts, assigned_by_val, task_display_name
+                )
 
-            original = st.session_state["tasks_cache"].iloc[found_idx]
+                if found_idx is None:
+                    errors.append(f"Could not find row for '{task_display_name}', skipping.")
+                    continue
 
-            # DELETE possible only if user created the task
-            if edited.iloc[i]["Delete"] == "Yes":
-                if original["assigned_by"] == email:
-                    deletions.append(found_idx)
-                else:
-                    st.warning(f"Cannot delete '{task_display_name}' — you did not create it.")
-                continue
+                original = st.session_state["tasks_cache"].iloc[found_idx]
+
+                # DELETE possible only if user created the task
+                if delete_flag == "Yes":
+                    if original["assigned_by"] == email:
+                        deletions.append(found_idx)
+                    else:
+                        st.warning(f"Cannot delete '{task_display_name}' — you did not create it.")
+                    continue
 
-            # STATUS CHANGE
-            old_status = original["status"]
-            new_status = edited.iloc[i]["Status"]
+                # STATUS CHANGE
+                old_status = original["status"]
 
-            if new_status != old_status:
-                with st.spinner("Saving status..."):
+                if new_status != old_status:
                     update_single_cell_in_sheet(found_idx, "status", new_status)
                     log_audit("status_change", task_display_name, email, old_status, new_status)
                     changes += 1
 
-        # Deletions
-        if deletions:
-            with st.spinner("Deleting rows..."):
-                for ridx in sorted(set(deletions), reverse=True):
-                    task_name = st.session_state["tasks_cache"].at[ridx, "task"]
-                    delete_row_in_sheet(ridx)
-                    log_audit("deleted", task_name, email, "", "")
+            # Deletions
+            for ridx in sorted(set(deletions)):
+                task_name = st.session_state["tasks_cache"].at[ridx, "task"]
+                delete_row_in_sheet(ridx)
+                log_audit("deleted", task_name, email, "", "")
 
         # Refresh
         if changes > 0 or deletions:
-            st.session_state.pop("edited_assigned_tasks", None)
-            st.session_state.pop("edited_tasks", None)
             total = changes + len(deletions)
             show_toast(f"Saved {total} change(s)!", tone="info")
             st.rerun()
@@ -1572,6 +1920,9 @@ else:
             else:
                 st.info("No changes to save.")
 
+# Flush audit events from this pass (reached only when no rerun was triggered)
+flush_audit_log()
+
 # ============================================================
 # End
 # ============================================================
@@ -0,0 +1,21 @@
+"""
+app.py runs Streamlit at import time, so tests pull the definitions they
+need out of the source with ast and execute them in a namespace of fakes.
+"""
+import ast
+from pathlib import Path
+
+APP_PY = Path(__file__).resolve().parents[1] / "app.py"
+
+
+def load_app_names(names, namespace):
+    """Exec the top-level functions / assignments called `names` into namespace."""
+    tree = ast.parse(APP_PY.read_text(encoding="utf-8"))
+    nodes = [
+        node for node in tree.body
+        if (isinstance(node, ast.FunctionDef) and node.name in names)
+        or (isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id in names for t in node.targets))
+    ]
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(APP_PY), "exec"), namespace)
+    return namespace
@@ -0,0 +1,107 @@
+"""batched_writes(): cache and audit log change only after the sheet write succeeds."""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app_source import load_app_names
+
+NAMES = {
+    "COLS", "VERSION_COL", "CREATED_DAY_COL", "NAT_DAY", "DERIVED_DATE_COLS",
+    "DELETED_STATUS", "TASK_STATUSES", "STATUS_DTYPE", "EMAIL_CATEGORY_COLS",
+    "INDEX_KEY_COLS", "AUDIT_FLUSH_SIZE", "_write_batch",
+    "day_number", "_to_timestamps", "_parse_date", "_ensure_category", "_touch_tasks_cache",
+    "_set_cached_cell", "next_row_version", "apply_cell_updates", "batched_writes",
+    "_reflect_cell_in_cache", "update_single_cell_in_sheet", "delete_row_in_sheet",
+    "log_audit", "_buffer_audit_events", "flush_audit_log",
+}
+
+
+class QuotaError(Exception):
+    pass
+
+
+class FakeSheet:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def batch_update(self, body, value_input_option=None):
+        if self.fail:
+            raise QuotaError("429: quota exceeded")
+        self.batches.append(body)
+
+
+def make_app(fail=False):
+    ns = {
+        "st": SimpleNamespace(session_state={}),
+        "np": np, "pd": pd, "time": time, "datetime": datetime,
+        "threading": threading, "contextmanager": contextmanager,
+        "sheet": FakeSheet(fail),
+        "audit_sheet": SimpleNamespace(append_rows=lambda rows, value_input_option=None: None),
+        "fetch_tasks_frame": SimpleNamespace(clear=lambda: None),
+        "cell_a1": lambda row, col: f"{col}{row + 2}",
+    }
+    load_app_names(NAMES, ns)
+    ns["index_rebuilds"] = 0
+
+    def build_index_map():
+        ns["index_rebuilds"] += 1
+    ns["build_index_map"] = build_index_map
+
+    df = pd.DataFrame({
+        "task": ["a", "b"], "description": ["", ""],
+        "assigned_to": ["x@med-x.ai", "y@med-x.ai"], "assigned_by": ["z@med-x.ai"] * 2,
+        "due_date": ["", ""], "status": ["Pending", "Pending"],
+        "created_at": ["2026-10-01T10:00:00", "2026-10-02T10:00:00"],
+        "row_version": [1, 1],
+    })
+    df["status"] = df["status"].astype(ns["STATUS_DTYPE"])
+    df["created_at_day"] = 0
+    df["due_date_parsed"] = pd.Series([pd.NaT, pd.NaT], dtype=object)
+    ns["st"].session_state["tasks_cache"] = df
+    return ns
+
+
+def save(ns):
+    with ns["batched_writes"]():
+        ns["update_single_cell_in_sheet"](0, "status", "Completed")
+        ns["log_audit"]("status_change", "a", "x@med-x.ai", "Pending", "Completed")
+        ns["delete_row_in_sheet"](1)
+        ns["log_audit"]("deleted", "b", "x@med-x.ai", "", "")
+
+
+def test_failed_batch_leaves_cache_and_audit_untouched():
+    ns = make_app(fail=True)
+    with pytest.raises(QuotaError):
+        save(ns)
+
+    state = ns["st"].session_state
+    df = state["tasks_cache"]
+    assert df["status"].tolist() == ["Pending", "Pending"]
+    assert df["row_version"].tolist() == [1, 1]
+    assert not state.get("_audit_buf")
+    assert ns["index_rebuilds"] == 0
+
+    # The batch is closed: a later write goes straight to the sheet again
+    ns["sheet"].fail = False
+    ns["update_single_cell_in_sheet"](0, "description", "d")
+    assert len(ns["sheet"].batches) == 1
+    assert df.at[0, "description"] == "d"
+
+
+def test_successful_batch_applies_cache_and_audit_once():
+    ns = make_app()
+    save(ns)
+
+    state = ns["st"].session_state
+    assert len(ns["sheet"].batches) == 1
+    assert len(ns["sheet"].batches[0]) == 4  # two cells + two row_version stamps
+    assert state["tasks_cache"]["status"].tolist() == ["Completed", "Deleted"]
+    assert [e[1] for e in state["_audit_buf"]] == ["status_change", "deleted"]
+    assert ns["index_rebuilds"] == 1
@@ -0,0 +1,48 @@
+"""Date parsing helpers from app.py (mixed-format sheet columns)."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app_source import load_app_names
+
+HELPERS = {"CREATED_DAY_COL", "NAT_DAY", "day_number", "_to_timestamps", "_parse_dates", "_parse_date"}
+
+H = load_app_names(HELPERS, {"np": np, "pd": pd})
+
+MIXED = pd.Series([
+    "2026/10/01",
+    "2026-10-20",
+    "2026-10-25",
+    "",
+    "not a date",
+    "2026-10-15T22:12:09.855293",
+    "2026-10-15T22:12:09",
+])
+
+
+def test_mixed_formats_parse_per_value():
+    parsed = H["_parse_dates"](MIXED, "due_date_parsed")
+    assert parsed.tolist()[:3] == [date(2026, 10, 1), date(2026, 10, 20), date(2026, 10, 25)]
+    assert pd.isna(parsed.iloc[3]) and pd.isna(parsed.iloc[4])
+    assert parsed.iloc[5] == parsed.iloc[6] == date(2026, 10, 15)
+
+
+def test_created_at_day_numbers():
+    days = H["_parse_dates"](MIXED, H["CREATED_DAY_COL"])
+    assert days.iloc[0] == H["day_number"](date(2026, 10, 1))
+    assert days.iloc[5] == days.iloc[6] == H["day_number"](date(2026, 10, 15))
+    assert days.iloc[3] == days.iloc[4] == H["NAT_DAY"]
+
+
+def test_scalar_matches_series():
+    for v in MIXED:
+        for col in ("due_date_parsed", H["CREATED_DAY_COL"]):
+            one = H["_parse_date"](v, col)
+            many = H["_parse_dates"](pd.Series([v]), col).iloc[0]
+            assert (pd.isna(one) and pd.isna(many)) or one == many
+
+
+def test_mixed_offsets_do_not_raise():
+    parsed = H["_parse_dates"](pd.Series(["2026-10-01", "2026-10-15T10:00:00+05:30"]), "due_date_parsed")
+    assert parsed.tolist() == [date(2026, 10, 1), date(2026, 10, 15)]